@@ -71,7 +71,8 @@ class LoguruConfig(ParsableConfiguration):
 
         inplace : bool, default False
             Whether modifications to the configuration should be made in-place. If False, a copy of the configuration
-            is made before modifications are made.
+            is made before modifications are made. Configurations loaded from a file are owned by the loaded object,
+            so they are never copied (regardless of this flag).
 
         configure : bool, optional
             Whether to configure the logger after loading the configuration. If False, the configuration is loaded but
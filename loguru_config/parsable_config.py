@@ -1,8 +1,12 @@
 import copy
+import functools
+import inspect
+import itertools
+from importlib.util import find_spec
 import pathlib
 import re
 import traceback
-from typing import TYPE_CHECKING, Union, Optional, Callable, Pattern, Tuple, Collection, Type
+from typing import TYPE_CHECKING, Any, Union, Optional, Callable, Pattern, Tuple, Collection, Mapping, Type, Set
 
 from loguru_config.utils import parsers
 import os
@@ -25,7 +29,87 @@ ext_protocol = re.compile(r'^ext://(.*)$')
 env_var_protocol = re.compile(r'^env://(.*)$')
 
 fmt_protocol = re.compile(r'^fmt://(.*)$')
-format_value_regex = re.compile(r'(\{[^{}]+\}|[^{}]+)')
+
+format_value_regex = re.compile(r'(?P<field>\{[^{}]+\})|(?P<text>[^{}]+|[{}])')
+
+# Protocols whose results are not reused for repeated strings: files may change, references depend on how far the
+# (in-place) parsing got, and `fmt://` fields are reused anyway.
+_unmemoized_protocols = frozenset(['file', 'cfg', 'fmt'])
+
+_json_value_starts = frozenset('{["-0123456789tfn')
+
+_loaders_by_extension = {
+    '.json': load_json_config,
+    '.yaml': load_yaml_config,
+    '.yml': load_yaml_config,
+    '.json5': load_json5_config,
+    '.toml': load_toml_config,
+}
+
+
+def _installed_loaders() -> list:
+    # The JSON loader only needs the standard library. Loaders whose optional backend is not installed are left out,
+    # instead of failing on import every time they are tried.
+    return [load_json_config] + [
+        loader for loader, backend in [
+            (load_yaml_config, 'yaml'),
+            (load_json5_config, 'pyjson5'),
+            (load_toml_config, 'toml')
+        ] if find_spec(backend) is not None
+    ]
+
+
+def _fast_deepcopy(obj):
+    # Configurations are mostly JSON-like data, which can be copied much faster by dispatching on the exact type than
+    # by `copy.deepcopy` and its memo-dict bookkeeping. Anything else is handed over to `copy.deepcopy`.
+    tp = type(obj)
+    if tp is dict:
+        return {k: _fast_deepcopy(v) for k, v in obj.items()}
+    if tp is list:
+        return [_fast_deepcopy(v) for v in obj]
+    if tp is tuple:
+        return tuple(_fast_deepcopy(v) for v in obj)
+    if tp in (str, int, float, bool) or obj is None:
+        return obj
+    return copy.deepcopy(obj)
+
+
+def _copy_containers(obj):
+    # Rebuilds the dicts, lists and tuples of `obj`, while sharing everything else (unlike `_fast_deepcopy`, so that
+    # e.g. streams are kept as they are).
+    kind = _element_kind(obj)
+    if kind is dict:
+        return {k: _copy_containers(v) for k, v in obj.items()}
+    if kind is list or kind is tuple:
+        return type(obj)(_copy_containers(v) for v in obj)
+    return obj
+
+
+# The kinds of elements that are handled while parsing, by their exact type. For these (by far the most common) types,
+# a single lookup replaces a chain of `isinstance` checks (see `_element_kind`).
+_element_kinds = {
+    str: str,
+    dict: dict,
+    list: list,
+    tuple: tuple,
+    int: None,
+    float: None,
+    bool: None,
+    type(None): None,
+}
+
+_unknown_kind = object()
+
+# Marks the stack entries of `ParsableConfiguration._recursive_parse` that convert a parsed tuple back.
+_tuple_marker = object()
+
+
+def _element_kind(element) -> Optional[type]:
+    kind = _element_kinds.get(type(element), _unknown_kind)
+    if kind is _unknown_kind:
+        # Subclasses of the handled types are handled like them.
+        kind = next((tp for tp in (str, dict, list, tuple) if isinstance(element, tp)), None)
+    return kind
 
 
 class ParsableConfiguration:
@@ -40,25 +124,31 @@ class ParsableConfiguration:
     """
 
     supported_protocol_parsers: Collection[Tuple[
-        Union[Callable[[str], bool], Pattern],
-        Callable[['ParsableConfiguration', str], str]
+        Union[Callable[[str], bool], Pattern, str],
+        Union[Callable[['ParsableConfiguration', str], Any], staticmethod, classmethod]
     ]]
     """
-    The parsers that are supported by the configuration loader. The keys are the protocol parsers (either a callable
-    that takes a string and returns a boolean, or a compiled regular expression); the values are the protocol parsers
-    (callables that take a string and return a string).
+    The parsers that are supported by the configuration loader. The keys are the conditions (either a callable that
+    takes a string and returns a boolean, or a regular expression, compiled or not); the values are the protocol
+    parsers, which take the string and return its parsed value.
 
     In case when a regex is used as a key, and the regex has a group, the group is used as the value to be passed to
     the protocol parser. Otherwise (a callable or no group in the regex), the entire string is passed to the protocol
     parser.
+
+    The protocol parsers are bound to the configuration once per parse, the same way methods are: plain functions
+    receive the configuration as their first argument, `staticmethod`s receive only the string, and `classmethod`s
+    receive the configuration's class. Any other callable receives the configuration as its first argument as well.
     """
 
-    supported_loaders: Collection[Callable[[str], dict]] = [
-        load_json_config,
-        load_yaml_config,
-        load_json5_config,
-        load_toml_config
-    ]
+    supported_loaders: Collection[Callable[[str], dict]] = _installed_loaders()
+
+    _owned_parsables: Mapping[str, Any] = {}
+    """
+    The values of the parsables that are owned by this object (by their names), and therefore can be parsed in-place.
+    Other values (e.g. ones given to the constructor directly, or assigned after loading) have their containers copied
+    before they are parsed.
+    """
 
     def __init__(self, **kwargs):
         self.__dict__.update(kwargs)
@@ -78,7 +168,8 @@ class ParsableConfiguration:
 
         inplace : bool, default False
             Whether modifications to the configuration should be made in-place. If False, a copy of the configuration
-            is made before modifications are made.
+            is made before modifications are made. Configurations loaded from a file are owned by the loaded object,
+            so they are never copied (regardless of this flag).
 
         Returns
         -------
@@ -87,26 +178,52 @@ class ParsableConfiguration:
 
         """
 
-        if isinstance(config_or_file, dict):
-            if not inplace:
-                config_or_file = copy.deepcopy(config_or_file)
+        # Only a dictionary given by the caller may be shared, so it is the only case requiring a copy (parsing
+        # modifies the configuration in-place).
+        if not isinstance(config_or_file, dict):
+            config = cls._load_from_file(config_or_file)
+            if not isinstance(config, dict):
+                raise TypeError(f'Config must be a dict, not {type(config)!r}.')
+        elif inplace:
+            config = config_or_file
         else:
-            config_or_file = cls._load_from_file(config_or_file)
-            if not isinstance(config_or_file, dict):
-                raise TypeError(f'Config must be a dict, not {type(config_or_file)!r}.')
+            config = _fast_deepcopy(config_or_file)
 
-        return cls(**config_or_file)
+        parsable = cls(**config)
+        parsable._owned_parsables = {key: config[key] for key in parsable.__parsables__ if key in config}
+        return parsable
 
     def parse(self) -> 'Self':
         """
         Parse the configuration. The parsed configuration is stored in the same object.
         """
 
-        for key in self.__parsables__:
-            value = getattr(self, key)
-            if value is None:
-                continue
-            setattr(self, key, self._recursive_parse(value))
+        self._prepare_protocol_parsers()
+        # Results of repeated protocol strings (e.g. `ext://sys.stdout` in multiple handlers) are reused within a parse.
+        self._parse_memo = {}
+        self._file_cache = {}
+        # The parsed parsables are built (or copied) by this object.
+        owned = self._owned_parsables = dict(self._owned_parsables)
+        try:
+            # The parsables are usually plain instance attributes, which are accessed through `__dict__` directly.
+            # Others (e.g. class attributes or properties) go through `getattr` and `setattr`.
+            attributes = self.__dict__
+            for key in self.__parsables__:
+                is_instance_attribute = key in attributes
+                value = attributes[key] if is_instance_attribute else getattr(self, key)
+                if value is None:
+                    continue
+                if not (is_instance_attribute and owned.get(key) is value):
+                    value = _copy_containers(value)
+                # Subtrees without anything to parse (common in e.g. `levels` and `activation`) are skipped.
+                value = self._recursive_parse(value, self._scan_dirty(value))
+                if is_instance_attribute:
+                    attributes[key] = owned[key] = value
+                else:
+                    setattr(self, key, value)
+        finally:
+            self._parse_memo.clear()
+            self._file_cache.clear()
 
         return self
 
@@ -116,8 +233,25 @@ class ParsableConfiguration:
         with pathlib.Path(file_path).open('r') as f:
             file_contents = f.read()
 
+        # Contents that cannot start a JSON value (e.g. most YAML files) are not even attempted as JSON.
+        maybe_json = file_contents.lstrip()[:1] in _json_value_starts
+
         received_exceptions = {}
+
+        # The file's extension usually tells its format, so its loader is attempted first. In case it fails, the rest of
+        # the loaders are attempted as usual.
+        preferred_loader = _loaders_by_extension.get(pathlib.Path(file_path).suffix.lower())
+        if preferred_loader in cls.supported_loaders:
+            try:
+                return preferred_loader(file_contents)
+            except ImportError:
+                pass
+            except Exception as e:
+                received_exceptions[preferred_loader.__name__] = e
+
         for loader in cls.supported_loaders:
+            if loader is preferred_loader or (loader is load_json_config and not maybe_json):
+                continue
             try:
                 return loader(file_contents)
             except ImportError:
@@ -127,74 +261,204 @@ class ParsableConfiguration:
         else:
             # Arrived here without breaking, so no loader succeeded.
             formatted_exceptions = '\n'.join(
-                f'  - {loader_name}: {"".join(traceback.format_exception(type(e), e, e.__traceback__))}'
+                f'  - {loader_name}: {"".join(traceback.format_exception_only(type(e), e))}'
                 for loader_name, e in received_exceptions.items())
             raise SyntaxError(f'Could not load config file "{file_contents}" '
                               f'with any of the following loaders:\n{formatted_exceptions}')
 
-    def _recursive_parse(self, element: Union[dict, list, tuple, str]):
-        if isinstance(element, dict):
-            if '()' in element:
-                return parsers.parse_user_defined(element)
-            return {k: self._recursive_parse(v) for k, v in element.items()}
-        elif isinstance(element, (list, tuple)):
-            tp = type(element)
-            return tp(self._recursive_parse(v) for v in element)
-        elif isinstance(element, str):
-            return self._parse_string(element)
-        else:
-            return element
+    def _scan_dirty(self, element) -> Set[int]:
+        # Returns the IDs of `element` and its sub-elements that contain anything that should be parsed. Like
+        # `_recursive_parse`, the scan is iterative: every element is pushed together with a linked chain of its
+        # containers' IDs, so that a dirty element marks its containers as dirty too (stopping at one that already is).
+        every_string = bool(self._custom_protocol_parsers)
+        dirty_ids = set()
+        stack = [(element, None)]
+        while stack:
+            value, containers = stack.pop()
+            kind = _element_kind(value)
+            if kind is str:
+                dirty = every_string or '://' in value
+            elif kind is dict:
+                # User-defined dictionaries are replaced as a whole, so there is no need to scan their contents.
+                dirty = '()' in value
+                if not dirty:
+                    node = (id(value), containers)
+                    stack.extend((v, node) for v in value.values())
+            elif kind is list or kind is tuple:
+                dirty = False
+                node = (id(value), containers)
+                stack.extend((v, node) for v in value)
+            else:
+                dirty = False
+
+            if dirty:
+                dirty_ids.add(id(value))
+                while containers is not None and containers[0] not in dirty_ids:
+                    dirty_ids.add(containers[0])
+                    containers = containers[1]
+
+        return dirty_ids
+
+    def _recursive_parse(self, element: Union[dict, list, tuple, str], dirty_ids: Optional[Set[int]] = None):
+        # The configuration is walked iteratively, and parsed values are written back into their containers (so
+        # `element` must be owned by this object, see `parse`). Tuples are immutable, so they are parsed as lists. A
+        # marker pushed before their contents converts them back as soon as the contents were parsed, so that e.g.
+        # `cfg://` references later in the walk see the tuple. If `dirty_ids` is given (see `_scan_dirty`), elements
+        # that are not in it are left as they are.
+        root = [element]
+        stack = [(root, 0)]
+        while stack:
+            container, key = stack.pop()
+            if container is _tuple_marker:
+                container, key, tp = key
+                container[key] = tp(container[key])
+                continue
 
-    def _parse_string(self, config_str: str):
-        result = None
+            value = container[key]
+            if dirty_ids is not None and id(value) not in dirty_ids:
+                continue
+
+            kind = _element_kind(value)
+            if kind is str:
+                container[key] = self._parse_string(value)
+            elif kind is dict:
+                if '()' in value:
+                    container[key] = parsers.parse_user_defined(value)
+                else:
+                    # Pushed in reverse, so that the values are parsed in their original order.
+                    stack.extend((value, k) for k in reversed(list(value)))
+            elif kind is list or kind is tuple:
+                if kind is tuple:
+                    stack.append((_tuple_marker, (container, key, type(value))))
+                    value = container[key] = list(value)
+                stack.extend((value, i) for i in reversed(range(len(value))))
+
+        return root[0]
+
+    def _prepare_protocol_parsers(self):
+        # Split the parsers into the builtin ones (dispatched by their protocol prefix) and the user-defined ones.
+        # String conditions are compiled here once, rather than for every parsed string. This is done on every parse,
+        # since `supported_protocol_parsers` may be replaced after construction.
+        self._protocol_handlers = {}
+        self._custom_protocol_parsers = []
         for cond, handler in self.supported_protocol_parsers:
             if isinstance(cond, str):
                 cond = re.compile(cond)
+            elif not isinstance(cond, Pattern) and not callable(cond):
+                raise TypeError(f'Condition must be a regex, or callable, not {type(cond)!r}.')
+
+            # Binding the handlers here saves passing the configuration (or going through a wrapper) on every call.
+            if inspect.isfunction(handler) or isinstance(handler, (staticmethod, classmethod)):
+                handler = handler.__get__(self, type(self))
+            else:
+                handler = functools.partial(handler, self)
+
+            name = _builtin_protocol_names.get(cond) if isinstance(cond, Pattern) else None
+            if name is not None and name not in self._protocol_handlers:
+                # The number of user-defined parsers that precede the protocol, which are tried before it.
+                self._protocol_handlers[name] = (handler, len(self._custom_protocol_parsers))
+            else:
+                self._custom_protocol_parsers.append((cond, handler))
+
+    def _parse_string(self, config_str: str):
+        result = None
+        memoize = False
+        remaining_start = 0
+        if '://' in config_str:
+            if config_str in self._parse_memo:
+                return self._parse_memo[config_str]
+
+            # The builtin protocols are told apart by their prefix alone, without any regex matching.
+            protocol, _, value = config_str.partition('://')
+            entry = self._protocol_handlers.get(protocol)
+            if entry is not None:
+                # The parsers are tried in their order, so user-defined parsers listed before the protocol come first.
+                handler, remaining_start = entry
+                if remaining_start:
+                    result = self._parse_custom_protocols(config_str, 0, remaining_start)
+
+                # Keep the semantics of the protocols' `^...://(.*)$` patterns: a single trailing newline is dropped,
+                # and values spanning multiple lines do not match.
+                if value.endswith('\n'):
+                    value = value[:-1]
+                if result is None and '\n' not in value:
+                    result = handler(value)
+                    memoize = protocol not in _unmemoized_protocols
+        elif not self._custom_protocol_parsers:
+            # None of the builtin protocols can match, and there are no user-defined ones to try.
+            return config_str
+
+        if result is None:
+            result = self._parse_custom_protocols(config_str, remaining_start, None)
+            if result is None:
+                return config_str
+
+        # Even though we just loaded it, we allow it to be parsed further. Only strings and containers can contain
+        # anything to parse.
+        if isinstance(result, str):
+            result = self._parse_string(result)
+        elif isinstance(result, (dict, list, tuple)):
+            # The result may be shared (e.g. by `ext://` or `cfg://`), so it is parsed in a copy of its own.
+            result = self._recursive_parse(_copy_containers(result))
+
+        # Containers are not reused, so that every occurrence gets an object of its own.
+        if memoize and not isinstance(result, (dict, list, tuple, set)):
+            self._parse_memo[config_str] = result
+        return result
+
+    def _parse_custom_protocols(self, config_str: str, start: int, stop: Optional[int]):
+        # Tries the user-defined parsers in the given range (in order), and returns the first non-None result.
+        for cond, handler in itertools.islice(self._custom_protocol_parsers, start, stop):
             if isinstance(cond, Pattern):
                 match = cond.match(config_str)
-                if match:
-                    # Check if it has groups, then take the first. Otherwise, pass the original string.
-                    if match.groups():
-                        result = handler(self, match.group(1))
-                    else:
-                        result = handler(self, config_str)
-            elif callable(cond):
-                if cond(config_str):
-                    result = handler(self, config_str)
+                if not match:
+                    continue
+                # Check if it has groups, then take the first. Otherwise, pass the original string.
+                result = handler(match.group(1) if match.groups() else config_str)
+            elif cond(config_str):
+                result = handler(config_str)
             else:
-                raise TypeError(f'Condition must be a regex, or callable, not {type(cond)!r}.')
+                continue
 
             if result is not None:
-                # Even though we just loaded it, we allow it to be parsed further (as a string).
-                return self._recursive_parse(result)
-
-        return config_str
+                return result
+        return None
 
     def _parse_log_part(self, file_path: PathLikeStr):
-        loaded = self._load_from_file(file_path)
-        return self._recursive_parse(loaded)
+        # A file referenced multiple times is only loaded once per parse. Since parsing modifies the loaded contents
+        # in-place, every reference parses its own copy of them.
+        key = os.path.realpath(file_path)
+        if key not in self._file_cache:
+            self._file_cache[key] = self._load_from_file(file_path)
+        return self._recursive_parse(_fast_deepcopy(self._file_cache[key]))
 
     def _parse_format(self, format_str: str):
-        # Split by { and } to get the parts that are not inside curly braces.
-        parts = format_value_regex.split(format_str)
-        for i, part in enumerate(parts):
-            if part.startswith('{') and part.endswith('}'):
-                part = parts[i] = part[1:-1]
-                if part.startswith('{') and part.endswith('}'):
-                    # This is an escaped curly brace part, so we skip it.
-                    parts[i] = part[1:-1]
-                else:
-                    # This is a curly brace part, so we need to parse it.
-                    parts[i] = str(self._parse_string(parts[i]))
+        # Fields are the innermost curly-brace parts. In an escaped part (`{{...}}`), the outer braces are matched as
+        # single-brace text around the field, so they are kept as literal braces.
+        parts = []
+        for match in format_value_regex.finditer(format_str):
+            if match.lastgroup == 'field':
+                parts.append(str(self._parse_string(match.group()[1:-1])))
+            else:
+                parts.append(match.group())
 
         return ''.join(parts)
 
 
 ParsableConfiguration.supported_protocol_parsers = [
-    (literal_protocol, lambda self, name: parsers.parse_literal(name)),
-    (ext_protocol, lambda self, ref: parsers.parse_external(ref)),
-    (env_var_protocol, lambda self, name: os.environ[name]),
+    (literal_protocol, staticmethod(parsers.parse_literal)),
+    (ext_protocol, staticmethod(parsers.parse_external)),
+    (env_var_protocol, staticmethod(os.environ.__getitem__)),
     (file_protocol, ParsableConfiguration._parse_log_part),
     (cfg_protocol, parsers.parse_reference),
     (fmt_protocol, ParsableConfiguration._parse_format)
 ]
+
+_builtin_protocol_names = {
+    literal_protocol: 'literal',
+    ext_protocol: 'ext',
+    env_var_protocol: 'env',
+    file_protocol: 'file',
+    cfg_protocol: 'cfg',
+    fmt_protocol: 'fmt',
+}
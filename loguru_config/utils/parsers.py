@@ -1,10 +1,27 @@
 import ast
 import importlib
+import json
+import re
 import sys
 from typing import Any, Mapping, Union, Sequence, Callable, Optional
 import os
 import inspect
 
+_missing = object()
+
+_user_defined_special_keys = ('()', '*')
+
+_constant_literals = {'True': True, 'False': False, 'None': None}
+# Decimal integers and floats, exactly as accepted by `ast.literal_eval` (except for the rarer underscores, which are
+# left to it). E.g. `'010'`, `'inf'` and `'nan'` are not Python literals.
+_int_literal = re.compile(r'-?(?:0+|[1-9][0-9]*)')
+_float_literal = re.compile(r'-?(?:(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?|[0-9]+[eE][+-]?[0-9]+)')
+_json_starts = frozenset('"[{')
+
+
+def _reject_json_constant(constant: str):
+    raise ValueError(f'Not a python literal: {constant!r}.')
+
 
 def parse_literal(literal: str) -> Any:
     """
@@ -24,6 +41,10 @@ def parse_literal(literal: str) -> Any:
     >>> parse_literal(os.environ['TEST'])
     True
 
+    JSON arrays and objects are accepted as well (including JSON's ``null``, ``true`` and ``false``):
+    >>> parse_literal('{"a": [1, null, true]}')
+    {'a': [1, None, True]}
+
     Parameters
     ----------
     literal : str
@@ -40,6 +61,22 @@ def parse_literal(literal: str) -> Any:
     if literal == 'stdout':
         return sys.stdout
 
+    # Fast paths for the common cases, since `ast.literal_eval` parses a complete syntax tree.
+    if literal in _constant_literals:
+        return _constant_literals[literal]
+
+    if _int_literal.fullmatch(literal):
+        return int(literal)
+    if _float_literal.fullmatch(literal):
+        return float(literal)
+    # JSON and python escape sequences differ (e.g. for surrogate pairs), so strings with escapes are left to
+    # `ast.literal_eval`. So are `NaN` and `Infinity`, which are not Python literals.
+    if literal[:1] in _json_starts and '\\' not in literal:
+        try:
+            return json.loads(literal, parse_constant=_reject_json_constant)
+        except ValueError:
+            pass
+
     return ast.literal_eval(literal)
 
 
@@ -92,20 +129,14 @@ def parse_reference(reference_object: Union[Mapping, Sequence, Any], ref: str) -
     """
 
     current = reference_object
-    rest = ref.split('.')
-
-    while len(rest) > 0:
-        ref, *rest = rest
-
+    for ref in ref.split('.'):
         if isinstance(current, (list, tuple)):
             try:
                 current = current[int(ref)]
             except ValueError:
                 raise KeyError(f'Invalid reference: {ref!r}.')
         else:
-            if not isinstance(current, Mapping):
-                current = current.__dict__
-
+            current = current if isinstance(current, Mapping) else current.__dict__
             try:
                 current = current[ref]
             except KeyError:
@@ -130,6 +161,11 @@ def parse_external(external_ref: str) -> Any:
     >>> parse_external('sys.stdout')   # doctest: +SKIP
     <_io.TextIOWrapper name='<stderr>' mode='w' encoding='utf-8'>
     """
+    if external_ref == 'sys.stdout':
+        return sys.stdout
+    if external_ref == 'sys.stderr':
+        return sys.stderr
+
     name = external_ref.split('.')
     used = name.pop(0)
     try:
@@ -147,9 +183,6 @@ def parse_external(external_ref: str) -> Any:
         raise v from e
 
 
-_missing = object()
-
-
 def parse_user_defined(user_defined_dict: dict,
                        further_parsing_function: Optional[Callable[[Any], Any]] = None) -> Any:
     """
@@ -197,7 +230,7 @@ def parse_user_defined(user_defined_dict: dict,
     parsed: Any
         The parsed user-defined function.
     """
-    calling_function = user_defined_dict.pop('()', _missing)
+    calling_function = user_defined_dict.get('()', _missing)
     if calling_function is _missing:
         raise ValueError('User-defined handler must have a "()" key with the function to call.')
 
@@ -206,9 +239,13 @@ def parse_user_defined(user_defined_dict: dict,
     if not callable(calling_function):
         raise TypeError(f'User-defined handler must be callable, not {type(calling_function)!r}.')
 
-    args = user_defined_dict.pop('*', ())
-    if further_parsing_function is not None:
-        user_defined_dict = {k: further_parsing_function(v) for k, v in user_defined_dict.items()}
+    # The dictionary itself is left untouched, so the same definition can be parsed more than once.
+    args = user_defined_dict.get('*', ())
+    if further_parsing_function is None:
+        kwargs = {k: v for k, v in user_defined_dict.items() if k not in _user_defined_special_keys}
+    else:
+        kwargs = {k: further_parsing_function(v) for k, v in user_defined_dict.items()
+                  if k not in _user_defined_special_keys}
         args = [further_parsing_function(arg) for arg in args]
 
-    return calling_function(*args, **user_defined_dict)
+    return calling_function(*args, **kwargs)
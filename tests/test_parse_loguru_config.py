@@ -1,11 +1,16 @@
+import datetime
 import json
 import os
 import sys
 import io
+import re
 
 import pytest
 from loguru import logger
 from loguru_config import LoguruConfig
+from loguru_config import parsable_config
+from loguru_config.parsable_config import literal_protocol
+from collections import OrderedDict
 from contextlib import redirect_stdout
 
 
@@ -283,3 +288,283 @@ def test_loading_yaml_file(temp_file):
     assert configurator.levels == expected_config['levels']
     assert configurator.extra == expected_config['extra']
     assert configurator.activation == expected_config['activation']
+
+
+def test_custom_protocol_parser():
+    stream = io.StringIO()
+    with redirect_stdout(stream) as f:
+        config = LoguruConfig(
+            handlers=[
+                {
+                    'sink': 'ext://sys.stdout',
+                    'format': 'lower://{LEVEL} - {MESSAGE}',
+                    'level': 'upper://warning',
+                },
+            ])
+        config.supported_protocol_parsers = list(LoguruConfig.supported_protocol_parsers) + [
+            (re.compile(r'^upper://(.*)$'), lambda self, value: value.upper()),
+            (re.compile(r'^lower://(.*)$'), staticmethod(str.lower)),
+        ]
+
+        config.parse().configure()
+
+        logger.info('Hello, world!')
+        logger.critical('Hello, world!')
+
+    assert stream.getvalue() == 'CRITICAL - Hello, world!\n'
+
+
+def test_loading_actual_yaml_file(temp_file):
+    pytest.importorskip('yaml')
+    yaml_contents = """
+handlers:
+  - sink: ext://sys.stderr
+    format: '[{time}] {message}'
+extra:
+  common_to_all: default
+"""
+    with open(temp_file, 'w') as f:
+        f.write(yaml_contents)
+
+    configurator = LoguruConfig.load(temp_file, configure=False).parse()
+
+    assert configurator.handlers == [dict(sink=sys.stderr, format="[{time}] {message}")]
+    assert configurator.extra == {"common_to_all": "default"}
+
+
+def test_loading_invalid_file(temp_file):
+    with open(temp_file, 'w') as f:
+        f.write('{"handlers": [')
+
+    with pytest.raises(SyntaxError, match='load_json_config'):
+        LoguruConfig.load(temp_file, configure=False)
+
+
+def _recording_loader(calls, name, load):
+    def loader(file_contents):
+        calls.append(name)
+        return load(file_contents)
+
+    return loader
+
+
+def test_json_loader_is_skipped_for_yaml_contents(temp_file, monkeypatch):
+    calls = []
+    json_loader = _recording_loader(calls, 'json', json.loads)
+    yaml_loader = _recording_loader(calls, 'yaml', lambda file_contents: {'extra': {'common_to_all': 'default'}})
+    monkeypatch.setattr(parsable_config, 'load_json_config', json_loader)
+    monkeypatch.setattr(LoguruConfig, 'supported_loaders', [json_loader, yaml_loader])
+    with open(temp_file, 'w') as f:
+        f.write('extra:\n  common_to_all: default\n')
+
+    configurator = LoguruConfig.load(temp_file, configure=False)
+
+    assert configurator.extra == {'common_to_all': 'default'}
+    assert calls == ['yaml']
+
+
+@pytest.mark.parametrize('file_name,expected_calls', [
+    ('config.yaml', ['yaml']),
+    ('config.YML', ['yaml']),
+    ('config.json', ['json']),
+    ('config', ['json']),
+])
+def test_loading_by_extension(tmp_path, monkeypatch, file_name, expected_calls):
+    calls = []
+    json_loader = _recording_loader(calls, 'json', json.loads)
+    yaml_loader = _recording_loader(calls, 'yaml', json.loads)
+    monkeypatch.setattr(parsable_config, '_loaders_by_extension',
+                        {'.json': json_loader, '.yaml': yaml_loader, '.yml': yaml_loader})
+    monkeypatch.setattr(LoguruConfig, 'supported_loaders', [json_loader, yaml_loader])
+    config_file = tmp_path / file_name
+    config_file.write_text(json.dumps({'extra': {'common_to_all': 'default'}}))
+
+    configurator = LoguruConfig.load(config_file, configure=False).parse()
+
+    assert configurator.extra == {'common_to_all': 'default'}
+    assert calls == expected_calls
+
+
+def test_installed_loaders(monkeypatch):
+    monkeypatch.setattr(parsable_config, 'find_spec', lambda name: None)
+    assert parsable_config._installed_loaders() == [parsable_config.load_json_config]
+
+    monkeypatch.setattr(parsable_config, 'find_spec', lambda name: object())
+    assert parsable_config._installed_loaders() == [
+        parsable_config.load_json_config,
+        parsable_config.load_yaml_config,
+        parsable_config.load_json5_config,
+        parsable_config.load_toml_config,
+    ]
+
+
+def test_repeated_protocol_string_is_parsed_once():
+    calls = []
+
+    def count_calls(self, name):
+        calls.append(name)
+        return name
+
+    config = LoguruConfig(extra={'a': 'literal://1', 'b': 'literal://1', 'c': 'literal://2'})
+    config.supported_protocol_parsers = [
+        (literal_protocol, count_calls)
+    ] + list(LoguruConfig.supported_protocol_parsers)
+
+    config.parse()
+
+    assert config.extra == {'a': '1', 'b': '1', 'c': '2'}
+    assert calls == ['1', '2']
+
+
+@pytest.mark.parametrize('inplace', [False, True])
+def test_load_dict_inplace(inplace):
+    config_dict = {'extra': {'number': 'literal://13'}}
+
+    configurator = LoguruConfig.load(config_dict, inplace=inplace, configure=False).parse()
+
+    assert configurator.extra == {'number': 13}
+    assert config_dict == {'extra': {'number': 13 if inplace else 'literal://13'}}
+
+
+def test_parse_same_file_twice(temp_file):
+    with open(temp_file, 'w') as f:
+        json.dump({'number': 'literal://13'}, f)
+
+    config = LoguruConfig(extra={'a': f'file://{temp_file}', 'b': f'file://{temp_file}'})
+
+    config.parse()
+
+    assert config.extra == {'a': {'number': 13}, 'b': {'number': 13}}
+    assert config.extra['a'] is not config.extra['b']
+
+
+def test_parse_leaves_constructor_arguments_untouched():
+    os.environ['LVL'] = 'WARNING'
+    handlers = [{'sink': 'ext://sys.stdout', 'level': 'env://LVL'}]
+
+    config = LoguruConfig(handlers=handlers).parse()
+
+    assert config.handlers == [{'sink': sys.stdout, 'level': 'WARNING'}]
+    assert handlers == [{'sink': 'ext://sys.stdout', 'level': 'env://LVL'}]
+
+
+def test_parse_leaves_values_assigned_after_loading_untouched(temp_file):
+    with open(temp_file, 'w') as f:
+        json.dump({'extra': {'number': 'literal://13'}}, f)
+    handlers = [{'sink': 'ext://sys.stdout'}]
+
+    config = LoguruConfig.load(temp_file, configure=False)
+    config.handlers = handlers
+    config.parse()
+
+    assert config.extra == {'number': 13}
+    assert config.handlers == [{'sink': sys.stdout}]
+    assert handlers == [{'sink': 'ext://sys.stdout'}]
+
+
+def test_parse_nested_tuples():
+    config = LoguruConfig(extra={'a': ('literal://1', ['literal://2', ('literal://3', 'b')])}).parse()
+
+    assert config.extra == {'a': (1, [2, (3, 'b')])}
+    assert type(config.extra['a']) is tuple
+    assert type(config.extra['a'][1][1]) is tuple
+
+
+def test_reference_to_parsed_tuple():
+    config = LoguruConfig.load({'extra': {'t': ('literal://1', 2), 'r': 'cfg://extra.t', 'x': ['cfg://extra.t']}},
+                               configure=False).parse()
+
+    assert config.extra == {'t': (1, 2), 'r': (1, 2), 'x': [(1, 2)]}
+    assert type(config.extra['r']) is tuple
+    assert type(config.extra['x'][0]) is tuple
+
+
+@pytest.mark.parametrize('format_str,expected', [
+    ('fmt://{env://NAME}', '[name]'),
+    ('fmt://{{level}} - {env://NAME}', '{level} - [name]'),
+    ('fmt://{}', '{}'),
+    ('fmt://a{}b', 'a{}b'),
+])
+def test_parse_format(format_str, expected):
+    os.environ['NAME'] = '[name]'
+
+    config = LoguruConfig(extra={'formatted': format_str}).parse()
+
+    assert config.extra == {'formatted': expected}
+
+
+def test_repeated_container_results_are_not_shared():
+    config = LoguruConfig(extra={'a': 'literal://[1, 2]', 'b': 'literal://[1, 2]', 'c': 'cfg://extra.a'}).parse()
+
+    assert config.extra == {'a': [1, 2], 'b': [1, 2], 'c': [1, 2]}
+    assert config.extra['a'] is not config.extra['b']
+    assert config.extra['c'] is not config.extra['a']
+
+
+def test_clean_subtrees_are_left_untouched():
+    activation = [['my_module.secret', False], ['another_library.module', True]]
+    clean_extra = {'values': [1, 'a', ('b', None)]}
+    config_dict = {'activation': activation, 'extra': {'clean': clean_extra, 'dirty': 'literal://1'}}
+
+    config = LoguruConfig.load(config_dict, inplace=True, configure=False).parse()
+
+    assert config.activation is activation
+    assert config.extra['clean'] is clean_extra
+    assert config.extra == {'clean': {'values': [1, 'a', ('b', None)]}, 'dirty': 1}
+
+
+def test_parser_without_protocol_prefix_parses_every_string():
+    config = LoguruConfig(extra={'a': 'SHOUT', 'nested': [{'b': 'LOUD'}], 'c': 'quiet'})
+    config.supported_protocol_parsers = list(LoguruConfig.supported_protocol_parsers) + [
+        (str.isupper, staticmethod(str.lower)),
+    ]
+
+    config.parse()
+
+    assert config.extra == {'a': 'shout', 'nested': [{'b': 'loud'}], 'c': 'quiet'}
+
+
+def test_protocol_parsers_are_tried_in_order():
+    config = LoguruConfig(extra={'mine': 'ext://mything.x', 'builtin': 'ext://datetime.date'})
+    config.supported_protocol_parsers = [
+        (re.compile(r'^ext://mything\.(.*)$'), lambda self, value: f'custom:{value}'),
+    ] + list(LoguruConfig.supported_protocol_parsers)
+
+    config.parse()
+
+    assert config.extra == {'mine': 'custom:x', 'builtin': datetime.date}
+
+
+@pytest.mark.parametrize('loaded', [False, True])
+def test_parse_class_level_parsable(loaded):
+    class ExtendedConfig(LoguruConfig):
+        __parsables__ = ['extra', 'other']
+        other = {'x': 'literal://1'}
+
+    if loaded:
+        config = ExtendedConfig.load({'extra': {'y': 'literal://2'}}, configure=False)
+    else:
+        config = ExtendedConfig(extra={'y': 'literal://2'})
+
+    config.parse()
+
+    assert config.extra == {'y': 2}
+    assert config.other == {'x': 1}
+    assert ExtendedConfig.other == {'x': 'literal://1'}
+
+
+def test_parse_subclasses_of_builtin_types():
+    class Text(str):
+        pass
+
+    class Items(list):
+        pass
+
+    extra = OrderedDict(a=Text('literal://1'), b=Items(['literal://2', Text('c')]))
+
+    # Parsed in-place, so the subclasses themselves are walked.
+    config = LoguruConfig.load({'extra': extra}, inplace=True, configure=False).parse()
+
+    assert config.extra == {'a': 1, 'b': [2, 'c']}
+    assert type(config.extra) is OrderedDict
+    assert type(config.extra['b']) is Items
@@ -27,6 +27,10 @@ def test_doctest():
     ('[1, 2, 3]', [1, 2, 3]),
     ("{'a': 1, 'b': 2}", {'a': 1, 'b': 2}),
     ("'a'", 'a'),
+    ('"a"', 'a'),
+    ('-1e3', -1000.0),
+    ('0x10', 16),
+    ("(1, 'a')", (1, 'a')),
 ])
 def test_literal_simple(str_value, expected):
     match = literal_protocol.match(f'literal://{str_value}')
@@ -44,3 +48,29 @@ def test_parse_external(str_value, expected):
     match = ext_protocol.match(f'ext://{str_value}')
     assert match is not None
     assert parsers.parse_external(match.group(1)) == expected
+
+
+def test_parse_external_is_resolved_on_every_call(monkeypatch):
+    assert parsers.parse_external('datetime.date') is datetime.date
+
+    monkeypatch.setattr(datetime, 'date', datetime.datetime)
+    assert parsers.parse_external('datetime.date') is datetime.datetime
+
+
+def test_parse_user_defined_does_not_modify_definition():
+    definition = {'()': 'datetime.date', '*': [2020], 'month': 1, 'day': 1}
+
+    assert parsers.parse_user_defined(definition) == datetime.date(2020, 1, 1)
+    assert definition == {'()': 'datetime.date', '*': [2020], 'month': 1, 'day': 1}
+
+
+@pytest.mark.parametrize('str_value', ['010', '-inf', 'nan', '[NaN]', '[Infinity]'])
+def test_literal_rejects_non_python_literals(str_value):
+    with pytest.raises((SyntaxError, ValueError)):
+        parsers.parse_literal(str_value)
+
+
+def test_literal_json_constants():
+    assert parsers.parse_literal('[null, true, false]') == [None, True, False]
+    # Escapes keep their python meaning (JSON would combine the surrogates into a single character).
+    assert parsers.parse_literal(r'"\ud83d\ude00"') == '\ud83d\ude00'